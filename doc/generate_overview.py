@@ -1,16 +1,16 @@
 from sys import argv
-import re
 
 f = open(argv[-1], "r").read()
 
-regex = r"(## Overview.*\n)## Building.*"
+start = f.index("## Overview")
+end = f.index("\n## Building", start)
 
-m = re.search(regex, f, re.MULTILINE | re.DOTALL)
-
-subsection = m.groups()[0]
+subsection = f[start : end + 1]
 
 # Make headings one level higher
-subsection = subsection.replace("## ", "# ")
+subsection = "\n".join(
+    line[1:] if line.startswith("##") else line for line in subsection.split("\n")
+)
 
 print("Title: Overview\n")
 print(subsection)
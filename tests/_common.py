@@ -1,5 +1,6 @@
-import unittest, os, dbus
-import dbus.mainloop.glib
+import unittest, os
+from collections import namedtuple
+from functools import lru_cache
 from gi.repository import GLib, Gio
 
 import gi
@@ -7,76 +8,125 @@ import gi
 gi.require_version("Spiel", "1.0")
 from gi.repository import Spiel
 
-dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+from dasbus.connection import SessionMessageBus
 
 LOG_EVENTS = False
 
-STANDARD_VOICES = [
-    ["org.mock2.Speech.Provider", "English (Great Britain)", "gmw/en", ["en-gb", "en"]],
-    [
+VoiceInfo = namedtuple("VoiceInfo", "provider name identifier languages")
+
+STANDARD_VOICES = (
+    VoiceInfo(
+        "org.mock2.Speech.Provider",
+        "English (Great Britain)",
+        "gmw/en",
+        ("en-gb", "en"),
+    ),
+    VoiceInfo(
         "org.mock2.Speech.Provider",
         "English (Scotland)",
         "gmw/en-GB-scotland#misconfigured",
-        ["en-gb-scotland", "en"],
-    ],
-    [
+        ("en-gb-scotland", "en"),
+    ),
+    VoiceInfo(
         "org.mock2.Speech.Provider",
         "English (Lancaster)",
         "gmw/en-GB-x-gbclan",
-        ["en-gb-x-gbclan", "en-gb", "en"],
-    ],
-    ["org.mock2.Speech.Provider", "English (America)", "gmw/en-US", ["en-us", "en"]],
-    [
+        ("en-gb-x-gbclan", "en-gb", "en"),
+    ),
+    VoiceInfo(
+        "org.mock2.Speech.Provider", "English (America)", "gmw/en-US", ("en-us", "en")
+    ),
+    VoiceInfo(
         "org.mock.Speech.Provider",
         "Armenian (East Armenia)",
         "ine/hy",
-        ["hy", "hy-arevela"],
-    ],
-    [
+        ("hy", "hy-arevela"),
+    ),
+    VoiceInfo(
         "org.mock2.Speech.Provider",
         "Armenian (West Armenia)",
         "ine/hyw",
-        ["hyw", "hy-arevmda", "hy"],
-    ],
-    [
+        ("hyw", "hy-arevmda", "hy"),
+    ),
+    VoiceInfo(
         "org.mock.Speech.Provider",
         "Chinese (Cantonese)",
         "sit/yue",
-        ["yue", "zh-yue", "zh"],
-    ],
-    ["org.mock3.Speech.Provider", "Uzbek", "trk/uz", ["uz"]],
-]
+        ("yue", "zh-yue", "zh"),
+    ),
+    VoiceInfo("org.mock3.Speech.Provider", "Uzbek", "trk/uz", ("uz",)),
+)
+
+
+@lru_cache(maxsize=None)
+def get_settings():
+    return Gio.Settings.new("org.monotonous.libspiel")
 
 
 class BaseSpielTest(unittest.TestCase):
     def __init__(self, *args):
         super().__init__(*args)
 
+    @classmethod
+    def setUpClass(cls):
+        cls._service_dir = os.environ["TEST_SERVICE_DIR"]
+        cls._discarded_dir = os.environ["TEST_DISCARDED_SERVICE_DIR"]
+        # Run by all the wait helpers, their handlers are gone once it returns.
+        cls._loop = GLib.MainLoop.new(None, False)
+        cls._session_bus = session_bus = SessionMessageBus()
+        cls._active_providers = {
+            s for s in session_bus.proxy.ListNames() if s.endswith(".Speech.Provider")
+        }
+        cls._name_owner_subscription = session_bus.connection.signal_subscribe(
+            "org.freedesktop.DBus",
+            "org.freedesktop.DBus",
+            "NameOwnerChanged",
+            "/org/freedesktop/DBus",
+            None,
+            Gio.DBusSignalFlags.NONE,
+            cls._name_owner_changed_cb,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._session_bus.connection.signal_unsubscribe(cls._name_owner_subscription)
+
+    @classmethod
+    def _name_owner_changed_cb(cls, connection, sender, path, iface, signal, params):
+        name, old_owner, new_owner = params.unpack()
+        if not name.endswith(".Speech.Provider"):
+            return
+        if new_owner:
+            cls._active_providers.add(name)
+        else:
+            cls._active_providers.discard(name)
+
     def setUp(self):
+        self._voice_cache = {}
+        self._mocks = {}
         self.mock_service = self.mock_iface("org.mock.Speech.Provider")
-        self.mock_service.SetInfinite(False)
-        self.mock_service.FlushTasks()
+        self.mock_service.Reset()
 
     def tearDown(self):
-        settings = Gio.Settings.new("org.monotonous.libspiel")
+        settings = get_settings()
         settings["default-voice"] = None
         settings["language-voice-mapping"] = {}
-        discarded_dir = os.environ["TEST_DISCARDED_SERVICE_DIR"]
-        service_dir = os.environ["TEST_SERVICE_DIR"]
-        for fname in os.listdir(discarded_dir):
-            os.rename(
-                os.path.join(discarded_dir, fname), os.path.join(service_dir, fname)
-            )
+        with os.scandir(self._discarded_dir) as it:
+            for entry in it:
+                os.replace(entry.path, os.path.join(self._service_dir, entry.name))
 
     def mock_iface(self, provider_name):
-        session_bus = dbus.SessionBus()
-        proxy = session_bus.get_object(
+        mock = self._mocks.get(provider_name)
+        if mock is not None:
+            return mock
+
+        mock = self._session_bus.get_proxy(
             provider_name,
-            f"/{'/'.join(provider_name.split('.'))}",
-        )
-        return dbus.Interface(
-            proxy, dbus_interface="org.freedesktop.Speech.MockProvider"
+            "/" + provider_name.replace(".", "/"),
+            interface_name="org.freedesktop.Speech.MockProvider",
         )
+        self._mocks[provider_name] = mock
+        return mock
 
     def kill_provider(self, provider_name):
         try:
@@ -84,18 +134,6 @@ class BaseSpielTest(unittest.TestCase):
         except:
             pass
 
-    def list_active_providers(self):
-        session_bus = dbus.SessionBus()
-        bus_obj = session_bus.get_object(
-            "org.freedesktop.DBus", "/org/freedesktop/DBus"
-        )
-        iface = dbus.Interface(bus_obj, "org.freedesktop.DBus")
-        speech_providers = filter(
-            lambda s: s.endswith(".Speech.Provider"),
-            iface.ListNames(),
-        )
-        return [str(s) for s in speech_providers]
-
     def wait_for_async_speaker_init(self):
         def _init_cb(source, result, user_data):
             user_data.append(Spiel.Speaker.new_finish(result))
@@ -103,55 +141,58 @@ class BaseSpielTest(unittest.TestCase):
 
         speakerContainer = []
         Spiel.Speaker.new(None, _init_cb, speakerContainer)
-        loop = GLib.MainLoop()
+        loop = self._loop
         loop.run()
         return speakerContainer[0]
 
     def wait_for_provider_to_go_away(self, name):
-        def _cb(*args):
-            self.assertNotIn(name, self.list_active_providers())
-            session_bus.remove_signal_receiver(
-                _cb,
-                bus_name="org.freedesktop.DBus",
-                dbus_interface="org.freedesktop.DBus",
-                signal_name="NameOwnerChanged",
-                path="/org/freedesktop/DBus",
-                arg0=name,
-            )
+        def _cb(connection, sender, path, iface, signal, params):
+            _name, old_owner, new_owner = params.unpack()
+            self.assertFalse(new_owner)
+            self._active_providers.discard(name)
+            connection.signal_unsubscribe(subscription_id)
             GLib.idle_add(loop.quit)
 
-        speech_providers = self.list_active_providers()
-        if name not in speech_providers:
-            return
-
-        session_bus = dbus.SessionBus()
-        sig_match = session_bus.add_signal_receiver(
+        connection = self._session_bus.connection
+        # Subscribe before asking the bus, so the name can't go away in between.
+        subscription_id = connection.signal_subscribe(
+            "org.freedesktop.DBus",
+            "org.freedesktop.DBus",
+            "NameOwnerChanged",
+            "/org/freedesktop/DBus",
+            name,
+            Gio.DBusSignalFlags.NONE,
             _cb,
-            bus_name="org.freedesktop.DBus",
-            dbus_interface="org.freedesktop.DBus",
-            signal_name="NameOwnerChanged",
-            path="/org/freedesktop/DBus",
-            arg0=name,
         )
-        loop = GLib.MainLoop()
+        # The tracked set is only updated when the main context dispatches,
+        # synchronous speaker construction can leave it stale.
+        if not self._session_bus.proxy.NameHasOwner(name):
+            connection.signal_unsubscribe(subscription_id)
+            self._active_providers.discard(name)
+            return
+
+        loop = self._loop
         loop.run()
 
     def wait_for_voices_changed(self, speaker, added=[], removed=[]):
         voices = speaker.props.voices
-
-        def _cb(*args):
-            voice_ids = [v.props.identifier for v in voices]
-            for a in added:
-                if a not in voice_ids:
-                    return
-            for r in removed:
-                if r in voice_ids:
-                    return
+        voice_ids = [v.props.identifier for v in voices]
+        added = set(added)
+        removed = set(removed)
+
+        def _cb(model, position, n_removed, n_added):
+            voice_ids[position : position + n_removed] = [
+                model.get_item(i).props.identifier
+                for i in range(position, position + n_added)
+            ]
+            known_ids = set(voice_ids)
+            if not added.issubset(known_ids) or not removed.isdisjoint(known_ids):
+                return
             voices.disconnect_by_func(_cb)
             loop.quit()
 
         voices.connect("items-changed", _cb)
-        loop = GLib.MainLoop()
+        loop = self._loop
         loop.run()
 
     def wait_for_speaking_done(self, speaker, action):
@@ -162,81 +203,87 @@ class BaseSpielTest(unittest.TestCase):
 
         speaker.connect("notify::speaking", _cb)
         action()
-        loop = GLib.MainLoop()
+        loop = self._loop
         loop.run()
 
     def uninstall_provider(self, name):
-        src = os.path.join(
-            os.environ["TEST_SERVICE_DIR"], f"{name}{os.path.extsep}service"
-        )
-        dest = os.path.join(
-            os.environ["TEST_DISCARDED_SERVICE_DIR"], f"{name}{os.path.extsep}service"
-        )
-        os.rename(src, dest)
+        self._move_service_file(name, self._service_dir, self._discarded_dir)
 
     def install_provider(self, name):
-        src = os.path.join(
-            os.environ["TEST_DISCARDED_SERVICE_DIR"], f"{name}{os.path.extsep}service"
-        )
-        dest = os.path.join(
-            os.environ["TEST_SERVICE_DIR"], f"{name}{os.path.extsep}service"
-        )
-        os.rename(src, dest)
+        self._move_service_file(name, self._discarded_dir, self._service_dir)
+
+    def _move_service_file(self, name, src_dir, dest_dir):
+        fname = f"{name}{os.path.extsep}service"
+        os.replace(os.path.join(src_dir, fname), os.path.join(dest_dir, fname))
 
     def get_voice(self, synth, provider_well_known_name, voice_id):
-        for v in synth.props.voices:
-            if (
-                v.props.provider.get_well_known_name() == provider_well_known_name
-                and v.props.identifier == voice_id
-            ):
-                return v
+        voices = synth.props.voices
+        voice_index = self._voice_cache.get(voices)
+        if voice_index is None:
+
+            def _invalidate_cb(model, *args):
+                self._voice_cache.pop(model, None)
+
+            voice_index = {
+                (v.props.provider.get_well_known_name(), v.props.identifier): v
+                for v in voices
+            }
+            self._voice_cache[voices] = voice_index
+            # The model can outlive the test, don't leave the handler behind.
+            handler_id = voices.connect("items-changed", _invalidate_cb)
+            self.addCleanup(voices.disconnect, handler_id)
+
+        return voice_index.get((provider_well_known_name, voice_id))
 
     def capture_speak_sequence(self, speaker, *utterances):
         event_sequence = []
+        append = event_sequence.append
 
         def _append_to_sequence(signal_and_args):
-            event_sequence.append(signal_and_args)
+            append(signal_and_args)
             if LOG_EVENTS:
                 print(signal_and_args)
 
         def _notify_speaking_cb(synth, val):
-            _append_to_sequence(["notify:speaking", synth.props.speaking])
-            if not synth.props.speaking:
+            speaking = synth.props.speaking
+            _append_to_sequence(("notify:speaking", speaking))
+            if not speaking:
                 loop.quit()
 
         def _notify_paused_cb(synth, val):
-            _append_to_sequence(["notify:paused", synth.props.paused])
-
-        def _utterance_started_cb(synth, utt):
-            _append_to_sequence(["utterance-started", utt])
-
-        def _utterance_word_started_cb(synth, utt, start, end):
-            _append_to_sequence(["word-started", utt, start, end])
-
-        def _utterance_sentence_started_cb(synth, utt, start, end):
-            _append_to_sequence(["sentence-started", utt, start, end])
-
-        def _utterance_canceled_cb(synth, utt):
-            _append_to_sequence(["utterance-canceled", utt])
-
-        def _utterance_finished_cb(synth, utt):
-            _append_to_sequence(["utterance-finished", utt])
+            _append_to_sequence(("notify:paused", synth.props.paused))
 
         def _utterance_error_cb(synth, utt, error):
             _append_to_sequence(
-                ["utterance-error", utt, (error.domain, error.code, error.message)]
+                ("utterance-error", utt, (error.domain, error.code, error.message))
             )
             if not synth.props.speaking:
                 loop.quit()
 
-        speaker.connect("notify::speaking", _notify_speaking_cb)
-        speaker.connect("notify::paused", _notify_paused_cb)
-        speaker.connect("utterance-started", _utterance_started_cb)
-        speaker.connect("utterance-canceled", _utterance_canceled_cb)
-        speaker.connect("utterance-finished", _utterance_finished_cb)
-        speaker.connect("utterance-error", _utterance_error_cb)
-        speaker.connect("word-started", _utterance_word_started_cb)
-        speaker.connect("sentence-started", _utterance_sentence_started_cb)
+        def _make_append_cb(signal_name):
+            def _cb(synth, *args):
+                _append_to_sequence((signal_name, *args))
+
+            return _cb
+
+        handlers = {
+            "notify::speaking": _notify_speaking_cb,
+            "notify::paused": _notify_paused_cb,
+            "utterance-error": _utterance_error_cb,
+        }
+        for signal_name in [
+            "utterance-started",
+            "utterance-canceled",
+            "utterance-finished",
+            "word-started",
+            "sentence-started",
+        ]:
+            handlers[signal_name] = _make_append_cb(signal_name)
+
+        handler_ids = [
+            speaker.connect(signal_name, handler)
+            for signal_name, handler in handlers.items()
+        ]
 
         def do_speak():
             for utterance in utterances:
@@ -244,9 +291,12 @@ class BaseSpielTest(unittest.TestCase):
 
         GLib.idle_add(do_speak)
 
-        loop = GLib.MainLoop()
+        loop = self._loop
         loop.run()
 
+        for handler_id in handler_ids:
+            speaker.disconnect(handler_id)
+
         return event_sequence
 
 
@@ -92,12 +92,12 @@ class TestSpeak(BaseSpielTest):
         ]
 
         expected_events = [
-            ["notify:speaking", True],
-            ["utterance-started", one],
-            ["utterance-finished", one],
-            ["utterance-started", two],
-            ["utterance-finished", two],
-            ["notify:speaking", False],
+            ("notify:speaking", True),
+            ("utterance-started", one),
+            ("utterance-finished", one),
+            ("utterance-started", two),
+            ("utterance-finished", two),
+            ("notify:speaking", False),
         ]
 
         actual_events = self.capture_speak_sequence(speaker, one, two)
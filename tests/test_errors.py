@@ -19,9 +19,9 @@ class TestSpeak(BaseSpielTest):
             "Message recipient disconnected from message bus without replying",
         )
         expected_events = [
-            ["notify:speaking", True],
-            ["utterance-error", utterance, expected_error],
-            ["notify:speaking", False],
+            ("notify:speaking", True),
+            ("utterance-error", utterance, expected_error),
+            ("notify:speaking", False),
         ]
 
         actual_events = self.capture_speak_sequence(speaker, utterance)
@@ -52,13 +52,13 @@ class TestSpeak(BaseSpielTest):
             "Voice output format not set correctly: 'nuthin'",
         )
         expected_events = [
-            ["notify:speaking", True],
-            ["utterance-started", one],
-            ["utterance-finished", one],
-            ["utterance-error", two, expected_error],
-            ["utterance-started", three],
-            ["utterance-finished", three],
-            ["notify:speaking", False],
+            ("notify:speaking", True),
+            ("utterance-started", one),
+            ("utterance-finished", one),
+            ("utterance-error", two, expected_error),
+            ("utterance-started", three),
+            ("utterance-finished", three),
+            ("notify:speaking", False),
         ]
 
         actual_events = self.capture_speak_sequence(speaker, one, two, three)
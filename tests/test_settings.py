@@ -3,7 +3,7 @@ from _common import *
 
 class SettingsTest(unittest.TestCase):
     def test_default_voice(self):
-        settings = Gio.Settings.new("org.monotonous.libspiel")
+        settings = get_settings()
 
         self.assertEqual(settings["default-voice"], None)
         settings["default-voice"] = ("org.mock2.Speech.Provider", "ine/hy")
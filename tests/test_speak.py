@@ -2,8 +2,33 @@ from _common import *
 
 
 class TestSpeak(BaseSpielTest):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # No test here changes the installed providers, so they share a speaker.
+        cls.speaker = Spiel.Speaker.new_sync(None)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.speaker
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        # Registered first so it runs after the test's handlers are gone.
+        self.addCleanup(self._unpause_speaker)
+
+    def _unpause_speaker(self):
+        # Canceling a paused utterance leaves the speaker paused.
+        if self.speaker.props.paused:
+            self.speaker.resume()
+
+    def connect_for_test(self, signal_name, handler):
+        handler_id = self.speaker.connect(signal_name, handler)
+        self.addCleanup(self.speaker.disconnect, handler_id)
+
     def test_speak(self):
-        speaker = Spiel.Speaker.new_sync(None)
+        speaker = self.speaker
 
         utterance = Spiel.Utterance(text="hello world, how are you?")
         utterance.props.voice = self.get_voice(
@@ -11,17 +36,17 @@ class TestSpeak(BaseSpielTest):
         )
 
         expected_events = [
-            ["notify:speaking", True],
-            ["utterance-started", utterance],
-            ["word-started", utterance, 0, 6],
-            ["sentence-started", utterance, 6, 13],
-            ["word-started", utterance, 6, 13],
-            ["word-started", utterance, 13, 17],
-            ["sentence-started", utterance, 17, 21],
-            ["word-started", utterance, 17, 21],
-            ["word-started", utterance, 21, 25],
-            ["utterance-finished", utterance],
-            ["notify:speaking", False],
+            ("notify:speaking", True),
+            ("utterance-started", utterance),
+            ("word-started", utterance, 0, 6),
+            ("sentence-started", utterance, 6, 13),
+            ("word-started", utterance, 6, 13),
+            ("word-started", utterance, 13, 17),
+            ("sentence-started", utterance, 17, 21),
+            ("word-started", utterance, 17, 21),
+            ("word-started", utterance, 21, 25),
+            ("utterance-finished", utterance),
+            ("notify:speaking", False),
         ]
 
         actual_events = self.capture_speak_sequence(speaker, utterance)
@@ -29,20 +54,20 @@ class TestSpeak(BaseSpielTest):
         self.assertEqual(actual_events, expected_events)
 
     def test_queue(self):
-        speaker = Spiel.Speaker.new_sync(None)
+        speaker = self.speaker
         [one, two, three] = [
             Spiel.Utterance(text=text) for text in ["one", "two", "three"]
         ]
 
         expected_events = [
-            ["notify:speaking", True],
-            ["utterance-started", one],
-            ["utterance-finished", one],
-            ["utterance-started", two],
-            ["utterance-finished", two],
-            ["utterance-started", three],
-            ["utterance-finished", three],
-            ["notify:speaking", False],
+            ("notify:speaking", True),
+            ("utterance-started", one),
+            ("utterance-finished", one),
+            ("utterance-started", two),
+            ("utterance-finished", two),
+            ("utterance-started", three),
+            ("utterance-finished", three),
+            ("notify:speaking", False),
         ]
 
         actual_events = self.capture_speak_sequence(speaker, one, two, three)
@@ -55,24 +80,24 @@ class TestSpeak(BaseSpielTest):
 
         def _notify_paused_cb(_speaker, val):
             if _speaker.props.paused:
-                GLib.idle_add(lambda: _speaker.resume())
+                GLib.idle_add(_speaker.resume)
             else:
                 self.mock_service.End()
 
         self.mock_service.SetInfinite(True)
-        speaker = Spiel.Speaker.new_sync(None)
-        speaker.connect("utterance-started", _started_cb)
-        speaker.connect("notify::paused", _notify_paused_cb)
+        speaker = self.speaker
+        self.connect_for_test("utterance-started", _started_cb)
+        self.connect_for_test("notify::paused", _notify_paused_cb)
 
         utterance = Spiel.Utterance(text="hello world, how are you?")
 
         expected_events = [
-            ["notify:speaking", True],
-            ["utterance-started", utterance],
-            ["notify:paused", True],
-            ["notify:paused", False],
-            ["utterance-finished", utterance],
-            ["notify:speaking", False],
+            ("notify:speaking", True),
+            ("utterance-started", utterance),
+            ("notify:paused", True),
+            ("notify:paused", False),
+            ("utterance-finished", utterance),
+            ("notify:speaking", False),
         ]
 
         actual_events = self.capture_speak_sequence(speaker, utterance)
@@ -81,22 +106,22 @@ class TestSpeak(BaseSpielTest):
 
     def test_cancel(self):
         def _started_cb(_speaker, utt):
-            GLib.idle_add(lambda: _speaker.cancel())
+            GLib.idle_add(_speaker.cancel)
 
         self.mock_service.SetInfinite(True)
 
-        speaker = Spiel.Speaker.new_sync(None)
-        speaker.connect("utterance-started", _started_cb)
+        speaker = self.speaker
+        self.connect_for_test("utterance-started", _started_cb)
 
         [one, two, three] = [
             Spiel.Utterance(text=text) for text in ["one", "two", "three"]
         ]
 
         expected_events = [
-            ["notify:speaking", True],
-            ["utterance-started", one],
-            ["utterance-canceled", one],
-            ["notify:speaking", False],
+            ("notify:speaking", True),
+            ("utterance-started", one),
+            ("utterance-canceled", one),
+            ("notify:speaking", False),
         ]
         actual_events = self.capture_speak_sequence(speaker, one, two, three)
 
@@ -104,26 +129,26 @@ class TestSpeak(BaseSpielTest):
 
     def test_pause_and_cancel(self):
         def _started_cb(_speaker, utt):
-            GLib.idle_add(lambda: _speaker.pause())
+            GLib.idle_add(_speaker.pause)
 
         def _notify_paused_cb(_speaker, val):
-            GLib.idle_add(lambda: _speaker.cancel())
+            GLib.idle_add(_speaker.cancel)
 
         actual_events = []
 
         self.mock_service.SetInfinite(True)
-        speaker = Spiel.Speaker.new_sync(None)
-        speaker.connect("utterance-started", _started_cb)
-        speaker.connect("notify::paused", _notify_paused_cb)
+        speaker = self.speaker
+        self.connect_for_test("utterance-started", _started_cb)
+        self.connect_for_test("notify::paused", _notify_paused_cb)
 
         utterance = Spiel.Utterance(text="hello world, how are you?")
 
         expected_events = [
-            ["notify:speaking", True],
-            ["utterance-started", utterance],
-            ["notify:paused", True],
-            ["utterance-canceled", utterance],
-            ["notify:speaking", False],
+            ("notify:speaking", True),
+            ("utterance-started", utterance),
+            ("notify:paused", True),
+            ("utterance-canceled", utterance),
+            ("notify:speaking", False),
         ]
 
         actual_events = self.capture_speak_sequence(speaker, utterance)
@@ -133,21 +158,21 @@ class TestSpeak(BaseSpielTest):
     def test_pause_then_speak(self):
         def _notify_paused_cb(_speaker, val):
             if _speaker.props.paused:
-                GLib.idle_add(lambda: _speaker.resume())
+                GLib.idle_add(_speaker.resume)
 
-        speaker = Spiel.Speaker.new_sync(None)
-        speaker.connect("notify::paused", _notify_paused_cb)
-        GLib.idle_add(lambda: speaker.pause())
+        speaker = self.speaker
+        self.connect_for_test("notify::paused", _notify_paused_cb)
+        GLib.idle_add(speaker.pause)
 
         utterance = Spiel.Utterance(text="hello world, how are you?")
 
         expected_events = [
-            ["notify:paused", True],
-            ["notify:speaking", True],
-            ["notify:paused", False],
-            ["utterance-started", utterance],
-            ["utterance-finished", utterance],
-            ["notify:speaking", False],
+            ("notify:paused", True),
+            ("notify:speaking", True),
+            ("notify:paused", False),
+            ("utterance-started", utterance),
+            ("utterance-finished", utterance),
+            ("notify:speaking", False),
         ]
 
         actual_events = self.capture_speak_sequence(speaker, utterance)
@@ -155,7 +180,7 @@ class TestSpeak(BaseSpielTest):
         self.assertEqual(actual_events, expected_events)
 
     def test_is_ssml(self):
-        speaker = Spiel.Speaker.new_sync(None)
+        speaker = self.speaker
 
         utterance = Spiel.Utterance(text="hello world, how are you?", language="hy")
         self.wait_for_speaking_done(speaker, lambda: speaker.speak(utterance))
@@ -170,7 +195,7 @@ class TestSpeak(BaseSpielTest):
         self.assertTrue(is_ssml)
 
     def test_provide_language(self):
-        speaker = Spiel.Speaker.new_sync(None)
+        speaker = self.speaker
 
         utterance = Spiel.Utterance(text="hello world, how are you?", language="hy")
         self.wait_for_speaking_done(speaker, lambda: speaker.speak(utterance))
@@ -1,7 +1,7 @@
 from _common import *
 
 
-class TestTypes(BaseSpielTest):
+class TestTypes(unittest.TestCase):
     def test_speaker(self):
         def _cb(*args):
             pass
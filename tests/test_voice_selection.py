@@ -3,7 +3,7 @@ from _common import *
 
 class TestSpeak(BaseSpielTest):
     def test_lang_settings(self):
-        settings = Gio.Settings.new("org.monotonous.libspiel")
+        settings = get_settings()
         settings["default-voice"] = ("org.mock.Speech.Provider", "ine/hy")
         settings["language-voice-mapping"] = {
             "en": ("org.mock2.Speech.Provider", "gmw/en-GB-x-gbclan")
@@ -27,13 +27,13 @@ class TestSpeak(BaseSpielTest):
         self.assertIn("hy", utterance.props.voice.props.languages)
 
     def test_default_voice(self):
+        # The speaker, and its registry, exist before the setting changes.
         speechSynthesis = Spiel.Speaker.new_sync(None)
-        settings = Gio.Settings.new("org.monotonous.libspiel")
+        settings = get_settings()
         settings["default-voice"] = ("org.mock.Speech.Provider", "ine/hy")
 
         utterance = Spiel.Utterance(text="hello world, how are you?", language="hy")
 
-        speechSynthesis = Spiel.Speaker.new_sync(None)
         self.wait_for_speaking_done(
             speechSynthesis, lambda: speechSynthesis.speak(utterance)
         )
@@ -46,7 +46,7 @@ class TestSpeak(BaseSpielTest):
         args = self.mock_iface(
             voice.props.provider.get_well_known_name()
         ).GetLastSpeakArguments()
-        self.assertEqual(str(args[2]), voice.props.identifier)
+        self.assertEqual(args[2], voice.props.identifier)
 
     def test_speak_with_voice_sync(self):
         speechSynthesis = Spiel.Speaker.new_sync(None)
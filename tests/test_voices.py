@@ -20,20 +20,15 @@ class TestVoices(BaseSpielTest):
     def _test_get_voices(self, speechSynthesis, expected_voices=STANDARD_VOICES):
         voices = speechSynthesis.props.voices
         voices_info = [
-            [
+            VoiceInfo(
                 v.props.provider.props.well_known_name,
                 v.props.name,
                 v.props.identifier,
-                v.props.languages,
-            ]
+                tuple(v.props.languages),
+            )
             for v in voices
         ]
-        _expected_voices = expected_voices[:]
-        _expected_voices.sort(key=lambda v: "-".join(v[:3]))
-        self.assertEqual(
-            voices_info,
-            _expected_voices,
-        )
+        self.assertEqual(voices_info, sorted(expected_voices, key=lambda v: v[:3]))
 
     def test_add_voice(self):
         speechSynthesis = self.wait_for_async_speaker_init()
@@ -43,40 +38,39 @@ class TestVoices(BaseSpielTest):
         self._test_get_voices(
             speechSynthesis,
             STANDARD_VOICES
-            + [
-                [
+            + (
+                VoiceInfo(
                     "org.mock.Speech.Provider",
                     "Hebrew",
                     "he",
-                    ["he", "he-il"],
-                ]
-            ],
+                    ("he", "he-il"),
+                ),
+            ),
         )
         self.mock_service.RemoveVoice("he")
         self.wait_for_voices_changed(speechSynthesis, removed=["he"])
         self._test_get_voices(speechSynthesis)
 
     def test_add_voice_from_inactive(self):
+        mock3 = self.mock_iface("org.mock3.Speech.Provider")
         speechSynthesis = self.wait_for_async_speaker_init()
         self.wait_for_provider_to_go_away("org.mock3.Speech.Provider")
-        self.mock_iface("org.mock3.Speech.Provider").AddVoice(
-            "Arabic", "ar", ["ar", "ar-ps", "ar-eg"]
-        )
+        mock3.AddVoice("Arabic", "ar", ["ar", "ar-ps", "ar-eg"])
         self.wait_for_voices_changed(speechSynthesis, added=["ar"])
         self._test_get_voices(
             speechSynthesis,
             STANDARD_VOICES
-            + [
-                [
+            + (
+                VoiceInfo(
                     "org.mock3.Speech.Provider",
                     "Arabic",
                     "ar",
-                    ["ar", "ar-ps", "ar-eg"],
-                ]
-            ],
+                    ("ar", "ar-ps", "ar-eg"),
+                ),
+            ),
         )
         self.wait_for_provider_to_go_away("org.mock3.Speech.Provider")
-        self.mock_iface("org.mock3.Speech.Provider").RemoveVoice("ar")
+        mock3.RemoveVoice("ar")
         self.wait_for_voices_changed(speechSynthesis, removed=["ar"])
         self._test_get_voices(speechSynthesis)
 